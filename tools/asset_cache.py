@@ -0,0 +1,49 @@
+"""
+asset_cache.py - Manifest and cache helpers shared by the asset tools.
+
+rom_extract.py and build_assets.py both skip work whose inputs have not
+changed. They record what they wrote in JSON manifests, and rom_extract.py
+also caches decompressed blocks. Everything here writes atomically, so an
+interrupted run never leaves a partial manifest or cache entry.
+
+Keys include code_version() of the tool modules that produce each output.
+Editing a converter or the decompressor therefore invalidates its outputs
+without a version number to bump by hand.
+"""
+
+import hashlib
+import json
+import os
+
+
+def code_version(*source_paths):
+    """Short hash of the given source files, for use in cache keys."""
+    digest = hashlib.sha256()
+    for path in source_paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:8]
+
+
+def atomic_write(path, data):
+    """Write data to path via a temporary file and a rename."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(path):
+    """Load a JSON manifest, or an empty one if missing or unreadable."""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def save_manifest(path, manifest):
+    """Atomically write a JSON manifest, creating its directory if needed."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, json.dumps(manifest, indent=1, sort_keys=True).encode())
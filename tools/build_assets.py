@@ -9,6 +9,18 @@ Pipeline stages:
 4. Tilemap conversion - SNES metatiles to DS BG map format
 5. Output to data/ directory for bin2o embedding
 
+Stages 2-4 import the converter modules and call them in-process, so
+each file costs one function call rather than one interpreter launch.
+Files are independent, so the tile and palette stages fan out over a
+process pool. Tilemap conversion costs less than starting the pool, so
+that stage runs in this process.
+
+Re-runs only redo stale work: stage 1 is skipped while rom_extract.py's
+manifest says assets_raw/ is up to date for the ROM, and data/.cache/
+manifest.json records, per converted output, a hash of its input and of
+its converter's source, so unchanged files are not converted again.
+--force ignores both.
+
 Directory structure:
   assets_raw/        - Extracted ROM data (from rom_extract.py)
     tilesets/        - SNES tile data
@@ -21,11 +33,21 @@ Directory structure:
 """
 
 import argparse
+import functools
+import hashlib
+import multiprocessing as mp
 import os
 import sys
 import subprocess
 from pathlib import Path
 
+# Import sibling modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tile_converter import convert_tiles
+from palette_converter import convert_palette
+from tilemap_converter import convert_tilemap, ds_map_name
+from asset_cache import code_version, load_manifest, save_manifest
+
 
 # Project paths
 TOOLS_DIR = Path(__file__).parent
@@ -35,9 +57,12 @@ DATA_DIR = PROJECT_DIR / "data"
 
 # Tool scripts
 ROM_EXTRACT_SCRIPT = TOOLS_DIR / "rom_extract.py"
-TILE_CONVERTER_SCRIPT = TOOLS_DIR / "tile_converter.py"
-PALETTE_CONVERTER_SCRIPT = TOOLS_DIR / "palette_converter.py"
-TILEMAP_CONVERTER_SCRIPT = TOOLS_DIR / "tilemap_converter.py"
+
+# input_key() of every converted output, by path relative to DATA_DIR
+CONVERT_MANIFEST = DATA_DIR / ".cache" / "manifest.json"
+
+# Below this many files a stage runs serially (pool startup would dominate)
+PARALLEL_MIN_FILES = 4
 
 
 def run_command(cmd, description):
@@ -49,10 +74,11 @@ def run_command(cmd, description):
         description: Human-readable description for error messages
     """
     print(f"[*] {description}")
+    sys.stdout.flush()  # Keep our output ahead of the child's
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        if result.stdout:
-            print(result.stdout, end='')
+        # stdout is inherited so the child's progress shows up live; only
+        # stderr is piped (and drained by run()) for the error report
+        subprocess.run(cmd, check=True, stderr=subprocess.PIPE, text=True)
         return True
     except subprocess.CalledProcessError as e:
         print(f"[ERROR] {description} failed:", file=sys.stderr)
@@ -63,26 +89,164 @@ def run_command(cmd, description):
         return False
 
 
+def run_converter(convert, input_path, output_path, description):
+    """
+    Run an in-process converter function and handle errors.
+
+    Args:
+        convert: Converter function taking (input_path, output_path)
+        input_path: Path to the input file
+        output_path: Path to the output file
+        description: Human-readable description for error messages
+    """
+    print(f"[*] {description}")
+    try:
+        convert(str(input_path), str(output_path))
+        return True
+    except Exception as e:
+        print(f"[ERROR] {description} failed:", file=sys.stderr)
+        print(f"Error: {e}", file=sys.stderr)
+        return False
+
+
+def _convert_one(job):
+    """Pool worker: run one (convert, input_path, output_path, description) job."""
+    convert, input_path, output_path, description = job
+    return input_path, run_converter(convert, input_path, output_path, description)
+
+
+def _count_converted(results):
+    """Count successful (path, ok) results, stopping at the first failure."""
+    converted = 0
+    for _, ok in results:
+        if not ok:
+            return -1
+        converted += 1
+    return converted
+
+
+@functools.lru_cache(maxsize=None)
+def converter_version(convert):
+    """code_version() of the module that defines a converter function."""
+    return code_version(sys.modules[convert.__module__].__file__)
+
+
+def input_key(convert, path):
+    """
+    Manifest key for converting path with convert: the SHA-256 prefix of
+    the input plus converter_version(), so editing a converter redoes
+    only the outputs it produces.
+    """
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    return f"{digest}-{converter_version(convert)}"
+
+
+def run_conversions(jobs, manifest, parallel=True):
+    """
+    Run the stale converter jobs across all CPU cores.
+
+    A job is skipped when its output exists and the manifest holds the
+    current input_key() for it. Converted outputs are recorded in the
+    manifest, which is saved after a successful stage.
+
+    Args:
+        jobs: List of (convert, input_path, output_path, description) tuples
+        manifest: Conversion manifest (CONVERT_MANIFEST), updated in place
+        parallel: False to run in this process (for conversions that cost
+                  less than starting the worker pool)
+
+    Returns:
+        Number of files converted or already up to date, or -1 on error
+    """
+    stale_jobs = []
+    keys = {}
+    for job in jobs:
+        convert, input_path, output_path, _ = job
+        output_name = Path(output_path).relative_to(DATA_DIR).as_posix()
+        key = input_key(convert, input_path)
+        if manifest.get(output_name) == key and os.path.isfile(output_path):
+            continue
+        keys[output_name] = key
+        stale_jobs.append(job)
+
+    fresh_count = len(jobs) - len(stale_jobs)
+    if fresh_count:
+        print(f"[*] {fresh_count} of {len(jobs)} files up to date, skipping")
+
+    if not parallel or len(stale_jobs) < PARALLEL_MIN_FILES:
+        converted = _count_converted(map(_convert_one, stale_jobs))
+    else:
+        # Flush so forked workers don't inherit (and re-emit) buffered output
+        sys.stdout.flush()
+
+        ncpus = mp.cpu_count()
+        chunksize = max(1, len(stale_jobs) // (4 * ncpus))
+        with mp.Pool(ncpus) as pool:
+            converted = _count_converted(pool.imap_unordered(_convert_one, stale_jobs, chunksize))
+            # Let workers exit normally so their buffered stdout is flushed;
+            # the pool's __exit__ would terminate() them and drop it
+            pool.close()
+            pool.join()
+
+    if converted < 0:
+        return -1
+
+    if keys:
+        manifest.update(keys)
+        save_manifest(str(CONVERT_MANIFEST), manifest)
+    return converted + fresh_count
+
+
+def list_bins(directory):
+    """
+    List the *.bin files in a directory, sorted by name.
+
+    os.scandir entries carry the file type from the directory listing, so
+    this avoids the per-file stat() and Path objects of Path.glob().
+
+    Returns:
+        List of os.DirEntry objects
+    """
+    with os.scandir(directory) as entries:
+        return sorted((entry for entry in entries
+                       if entry.name.endswith(".bin") and entry.is_file()),
+                      key=lambda entry: entry.name)
+
+
 def extract_rom(rom_path, force=False):
     """
     Run ROM extraction if needed.
 
+    Extraction is skipped when rom_extract.py's manifest shows assets_raw/
+    is up to date for the ROM, or when no ROM can be found but assets_raw/
+    already exists.
+
     Args:
         rom_path: Path to Super Metroid ROM (optional)
-        force: Force re-extraction even if assets_raw exists
+        force: Force re-extraction even if assets_raw is up to date
 
     Returns:
         True if extraction succeeded or was skipped, False on error
     """
-    if ASSETS_RAW_DIR.exists() and not force:
-        print(f"[*] assets_raw/ already exists, skipping ROM extraction (use --force to re-extract)")
-        return True
-
     if not ROM_EXTRACT_SCRIPT.exists():
         print(f"[WARNING] rom_extract.py not found at {ROM_EXTRACT_SCRIPT}, skipping ROM extraction",
               file=sys.stderr)
         return True
 
+    if not force:
+        from rom_extract import find_rom, load_rom, manifest_key, manifest_is_fresh
+
+        found_rom = find_rom(rom_path)
+        if found_rom is None:
+            if ASSETS_RAW_DIR.exists():
+                print(f"[*] No ROM found, using existing assets_raw/")
+                return True
+        elif manifest_is_fresh(str(ASSETS_RAW_DIR), manifest_key(load_rom(found_rom, verbose=False))):
+            print(f"[*] assets_raw/ is up to date for this ROM, skipping ROM extraction "
+                  f"(use --force to re-extract)")
+            return True
+
     cmd = [sys.executable, str(ROM_EXTRACT_SCRIPT)]
     if rom_path:
         cmd.extend(["--rom", rom_path])
@@ -92,12 +256,15 @@ def extract_rom(rom_path, force=False):
     return run_command(cmd, "Extracting ROM data")
 
 
-def convert_tilesets():
+def convert_tilesets(manifest):
     """
     Convert all tilesets from assets_raw/tilesets/ to data/tiles/
 
+    Args:
+        manifest: Conversion manifest, passed to run_conversions
+
     Returns:
-        Number of tilesets converted, or -1 on error
+        Number of tilesets converted or up to date, or -1 on error
     """
     tileset_dir = ASSETS_RAW_DIR / "tilesets"
     output_dir = DATA_DIR / "tiles"
@@ -108,34 +275,29 @@ def convert_tilesets():
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    tileset_files = sorted(tileset_dir.glob("*.bin"))
+    tileset_files = list_bins(tileset_dir)
     if not tileset_files:
         print(f"[WARNING] No tileset files (*.bin) found in {tileset_dir}", file=sys.stderr)
         return 0
 
-    converted = 0
-    for tileset_file in tileset_files:
-        output_file = output_dir / f"{tileset_file.stem}.ds.bin"
-        cmd = [
-            sys.executable, str(TILE_CONVERTER_SCRIPT),
-            str(tileset_file),
-            str(output_file)
-        ]
-
-        if run_command(cmd, f"Converting tileset: {tileset_file.name}"):
-            converted += 1
-        else:
-            return -1
-
-    return converted
+    jobs = [
+        (convert_tiles, tileset_file.path,
+         output_dir / f"{os.path.splitext(tileset_file.name)[0]}.ds.bin",
+         f"Converting tileset: {tileset_file.name}")
+        for tileset_file in tileset_files
+    ]
+    return run_conversions(jobs, manifest)
 
 
-def convert_palettes():
+def convert_palettes(manifest):
     """
     Convert all palettes from assets_raw/palettes/ to data/palettes/
 
+    Args:
+        manifest: Conversion manifest, passed to run_conversions
+
     Returns:
-        Number of palettes converted, or -1 on error
+        Number of palettes converted or up to date, or -1 on error
     """
     palette_dir = ASSETS_RAW_DIR / "palettes"
     output_dir = DATA_DIR / "palettes"
@@ -146,34 +308,29 @@ def convert_palettes():
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    palette_files = sorted(palette_dir.glob("*.bin"))
+    palette_files = list_bins(palette_dir)
     if not palette_files:
         print(f"[WARNING] No palette files (*.bin) found in {palette_dir}", file=sys.stderr)
         return 0
 
-    converted = 0
-    for palette_file in palette_files:
-        output_file = output_dir / f"{palette_file.stem}.ds.pal"
-        cmd = [
-            sys.executable, str(PALETTE_CONVERTER_SCRIPT),
-            str(palette_file),
-            str(output_file)
-        ]
-
-        if run_command(cmd, f"Converting palette: {palette_file.name}"):
-            converted += 1
-        else:
-            return -1
-
-    return converted
+    jobs = [
+        (convert_palette, palette_file.path,
+         output_dir / f"{os.path.splitext(palette_file.name)[0]}.ds.pal",
+         f"Converting palette: {palette_file.name}")
+        for palette_file in palette_files
+    ]
+    return run_conversions(jobs, manifest)
 
 
-def convert_tilemaps():
+def convert_tilemaps(manifest):
     """
     Convert all tilemaps from assets_raw/tilemaps/ to data/maps/
 
+    Args:
+        manifest: Conversion manifest, passed to run_conversions
+
     Returns:
-        Number of tilemaps converted, or -1 on error
+        Number of tilemaps converted or up to date, or -1 on error
     """
     tilemap_dir = ASSETS_RAW_DIR / "tilemaps"
     output_dir = DATA_DIR / "maps"
@@ -184,26 +341,20 @@ def convert_tilemaps():
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    tilemap_files = sorted(tilemap_dir.glob("*.bin"))
+    tilemap_files = list_bins(tilemap_dir)
     if not tilemap_files:
         print(f"[WARNING] No tilemap files (*.bin) found in {tilemap_dir}", file=sys.stderr)
         return 0
 
-    converted = 0
-    for tilemap_file in tilemap_files:
-        output_file = output_dir / f"{tilemap_file.stem}.ds.map"
-        cmd = [
-            sys.executable, str(TILEMAP_CONVERTER_SCRIPT),
-            str(tilemap_file),
-            str(output_file)
-        ]
-
-        if run_command(cmd, f"Converting tilemap: {tilemap_file.name}"):
-            converted += 1
-        else:
-            return -1
-
-    return converted
+    jobs = [
+        (convert_tilemap, tilemap_file.path,
+         output_dir / ds_map_name(tilemap_file.name),
+         f"Converting tilemap: {tilemap_file.name}")
+        for tilemap_file in tilemap_files
+    ]
+    # A tilemap converts with one table translate, far cheaper than
+    # starting worker processes
+    return run_conversions(jobs, manifest, parallel=False)
 
 
 def main():
@@ -212,7 +363,7 @@ def main():
     )
     parser.add_argument("--rom-path", help="Path to Super Metroid ROM (for extraction)")
     parser.add_argument("--force", action="store_true",
-                        help="Force re-extraction of ROM even if assets_raw exists")
+                        help="Re-extract the ROM and re-convert every file, ignoring manifests")
 
     args = parser.parse_args()
 
@@ -225,9 +376,12 @@ def main():
         print("\n[FAILED] ROM extraction failed", file=sys.stderr)
         sys.exit(1)
 
+    # With --force every output counts as stale
+    manifest = {} if args.force else load_manifest(str(CONVERT_MANIFEST))
+
     # Stage 2: Tile conversion
     print("\n" + "-" * 60)
-    tileset_count = convert_tilesets()
+    tileset_count = convert_tilesets(manifest)
     if tileset_count < 0:
         print("\n[FAILED] Tileset conversion failed", file=sys.stderr)
         sys.exit(1)
@@ -235,7 +389,7 @@ def main():
 
     # Stage 3: Palette conversion
     print("\n" + "-" * 60)
-    palette_count = convert_palettes()
+    palette_count = convert_palettes(manifest)
     if palette_count < 0:
         print("\n[FAILED] Palette conversion failed", file=sys.stderr)
         sys.exit(1)
@@ -243,7 +397,7 @@ def main():
 
     # Stage 4: Tilemap conversion
     print("\n" + "-" * 60)
-    tilemap_count = convert_tilemaps()
+    tilemap_count = convert_tilemaps(manifest)
     if tilemap_count < 0:
         print("\n[FAILED] Tilemap conversion failed", file=sys.stderr)
         sys.exit(1)
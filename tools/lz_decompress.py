@@ -18,9 +18,18 @@ Commands:
   $FF:     End of compressed data
 """
 
+import mmap
 import struct
 
 
+# Single-byte bytes objects for every value, so byte fills are one repeat
+_BYTE = [bytes((b,)) for b in range(256)]
+
+# Wrapping 0x00-0xFF ramp, long enough that any increasing fill
+# (start <= 0xFF, length <= 1024) is a single slice of it
+_RAMP = bytes(range(256)) * 5
+
+
 def decompress(data, offset=0, max_output=0x10000):
     """
     Decompress LC_LZ2 data starting at the given offset.
@@ -28,15 +37,23 @@ def decompress(data, offset=0, max_output=0x10000):
     Args:
         data: bytes or bytearray of the full ROM or data block
         offset: starting offset of compressed data
-        max_output: maximum output size (safety limit)
+        max_output: maximum output size (safety limit, output is truncated to it)
 
     Returns:
         bytearray of decompressed data
     """
-    output = bytearray()
+    # Preallocate the whole (zero-filled) output and write at a cursor,
+    # rather than growing the bytearray through repeated reallocations
+    output = bytearray(max_output)
+    op = 0
     pos = offset
 
-    while pos < len(data):
+    # Hot loop: keep the input length in a local, and read literal runs
+    # through a memoryview so they are copied once (into output), not twice
+    data_len = len(data)
+    src = memoryview(data)
+
+    while pos < data_len:
         # Read command byte
         cmd_byte = data[pos]
         pos += 1
@@ -58,58 +75,79 @@ def decompress(data, offset=0, max_output=0x10000):
             length = ((cmd_byte & 0x03) << 8) + data[pos] + 1
             pos += 1
 
+        # Never write past the end of the output buffer
+        if length > max_output - op:
+            length = max_output - op
+
         if command == 0:
             # Direct copy: copy L bytes from input to output
-            chunk = data[pos:pos + length]
-            output.extend(chunk)
+            chunk = src[pos:pos + length]
+            output[op:op + len(chunk)] = chunk
+            op += len(chunk)
             pos += length
 
         elif command == 1:
             # Byte fill: repeat 1 byte L times
             fill_byte = data[pos]
             pos += 1
-            output.extend(bytes([fill_byte]) * length)
+            output[op:op + length] = _BYTE[fill_byte] * length
+            op += length
 
         elif command == 2:
             # Word fill: alternate 2 bytes L times
             byte_a = data[pos]
             byte_b = data[pos + 1]
             pos += 2
-            for i in range(length):
-                output.append(byte_a if (i % 2 == 0) else byte_b)
+            pair = bytes((byte_a, byte_b))
+            output[op:op + length] = (pair * ((length + 1) // 2))[:length]
+            op += length
 
         elif command == 3:
             # Increasing fill: 1 byte, increment each time
             fill_byte = data[pos]
             pos += 1
-            for i in range(length):
-                output.append((fill_byte + i) & 0xFF)
+            output[op:op + length] = _RAMP[fill_byte:fill_byte + length]
+            op += length
 
         elif command == 4:
             # Back reference: 2 bytes = offset into output buffer
             ref_offset = data[pos] | (data[pos + 1] << 8)
             pos += 2
-            for i in range(length):
-                if ref_offset + i < len(output):
-                    output.append(output[ref_offset + i])
-                else:
-                    output.append(0)  # Safety: pad with zero
+            if ref_offset >= op:
+                op += length  # Safety: pad with zero (buffer is zero-filled)
+            else:
+                # Copy in bulk. A self-overlapping reference (RLE-style)
+                # can only copy what already exists, so each pass takes
+                # the whole available run and the next pass re-reads it.
+                copied = 0
+                while copied < length:
+                    start = ref_offset + copied
+                    n = min(length - copied, op - start)
+                    output[op:op + n] = output[start:start + n]
+                    op += n
+                    copied += n
 
         else:
             # Unknown command -- stop
             break
 
         # Safety check
-        if len(output) >= max_output:
+        if op >= max_output:
             break
 
+    # Trim the unused tail in place
+    del output[op:]
     return output
 
 
 def decompress_from_file(rom_path, offset, max_output=0x10000):
     """Convenience: decompress from a ROM file at the given offset."""
+    # Map rather than read: only the pages the stream touches are loaded
     with open(rom_path, 'rb') as f:
-        data = f.read()
+        try:
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except ValueError:  # Empty files cannot be mapped
+            data = memoryview(b'')
 
     # Handle optional 512-byte copier header
     if len(data) % 0x8000 == 512:
@@ -9,17 +9,86 @@ Both SNES and DS use BGR555 format (15-bit color, 1 bit unused):
   Bit 15:    Unused
 
 Since the formats are identical, this is a validation and pass-through tool.
+Valid palettes are hardlinked (or copied) unchanged; only palettes with
+bit 15 set are rewritten, with that bit cleared.
 Standard palette size: 512 bytes = 256 colors * 2 bytes per color.
 """
 
 import argparse
+import os
+import shutil
 import sys
 
 
+# High bytes (of a little-endian color word) that have bit 15 set
+BIT15_HIGH_BYTES = bytes(range(0x80, 0x100))
+
+# Translation table that clears bit 7 of a byte (bit 15 of the color word)
+CLEAR_BIT15_TABLE = bytes(b & 0x7F for b in range(256))
+
+
+def remove_output(output_path):
+    """
+    Remove an existing output file before it is replaced.
+
+    A previous run may have hardlinked the output to its input, so writing
+    through the old name would modify the input as well.
+    """
+    try:
+        os.remove(output_path)
+    except FileNotFoundError:
+        pass
+
+
+def copy_file(input_path, output_path):
+    """
+    Copy input_path to output_path without moving data through user space.
+
+    Uses os.copy_file_range where available (Linux), which copies inside
+    the kernel and may reflink on filesystems like XFS/Btrfs. Falls back
+    to shutil.copyfile on other platforms or if the kernel refuses.
+    """
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(input_path, 'rb') as src, open(output_path, 'wb') as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            return
+        except OSError:
+            pass
+
+    shutil.copyfile(input_path, output_path)
+
+
+def link_or_copy(input_path, output_path):
+    """
+    Make output_path an exact copy of input_path.
+
+    Hardlinks when both paths are on the same filesystem (no data is
+    copied), otherwise falls back to a kernel-side file copy. Does nothing
+    when both paths already name the same file, since removing the output
+    would delete the input.
+    """
+    if os.path.exists(output_path) and os.path.samefile(input_path, output_path):
+        return
+    remove_output(output_path)
+    try:
+        os.link(input_path, output_path)
+    except OSError:
+        copy_file(input_path, output_path)
+
+
 def convert_palette(input_path, output_path, expected_size=512):
     """
     Validate and copy SNES palette data to DS format.
 
+    Colors with bit 15 set are written back with the bit cleared; a palette
+    with no such colors is passed through without rewriting its bytes.
+
     Args:
         input_path: Path to input palette file
         output_path: Path to output palette file
@@ -39,19 +108,24 @@ def convert_palette(input_path, output_path, expected_size=512):
     color_count = len(palette_data) // 2
 
     # Optional validation: check if colors are valid BGR555 (bit 15 should be 0)
-    invalid_colors = 0
-    for i in range(color_count):
-        color = palette_data[i * 2] | (palette_data[i * 2 + 1] << 8)
-        if color & 0x8000:  # Bit 15 set
-            invalid_colors += 1
+    # Bit 15 is bit 7 of each odd (high) byte; count those in one C-level pass
+    # by deleting them and measuring how many went away.
+    high_bytes = palette_data[1::2]
+    invalid_colors = len(high_bytes) - len(high_bytes.translate(None, BIT15_HIGH_BYTES))
 
     if invalid_colors > 0:
-        print(f"Warning: {invalid_colors}/{color_count} colors have bit 15 set (should be 0 for BGR555)",
+        print(f"Warning: {invalid_colors}/{color_count} colors have bit 15 set (should be 0 for BGR555), clearing",
               file=sys.stderr)
 
-    # Write output (direct copy - formats are identical)
-    with open(output_path, 'wb') as f:
-        f.write(palette_data)
+        cleaned = bytearray(palette_data)
+        cleaned[1::2] = high_bytes.translate(CLEAR_BIT15_TABLE)
+
+        remove_output(output_path)
+        with open(output_path, 'wb') as f:
+            f.write(cleaned)
+    else:
+        # Formats are identical - pass the file through untouched
+        link_or_copy(input_path, output_path)
 
     print(f"Converted palette with {color_count} colors from '{input_path}' to '{output_path}'")
 
@@ -3,8 +3,15 @@ rom_addresses.py - Super Metroid ROM address constants and conversion utilities.
 
 SNES address space -> ROM file offset conversion.
 All addresses sourced from docs/rom_memory_map.md.
+
+ROM offsets below are precomputed literals (the SNES bank:addr each one
+came from is in its comment), and the raw bank tables are laid out from
+them by plain arithmetic, so importing this module calls no conversions.
+Run this file directly to check them against snes_to_rom().
 """
 
+from types import MappingProxyType
+
 # Super Metroid uses LoROM mapping (despite HiROM-like bank layout).
 # Community disassembly addresses use banks $80-$FF with addr $8000-$FFFF.
 # ROM offset = ((bank & 0x7F) * 0x8000) + (addr - 0x8000)
@@ -33,25 +40,37 @@ SM_HEADER_SIZE = 512    # Optional copier header
 
 # Room headers (Bank $8F)
 ROOM_HEADERS_BANK = 0x8F
-ROOM_HEADERS_START = snes_to_rom(0x8F, 0x91F8)  # First room header pointer
+ROOM_HEADERS_START = 0x0791F8  # $8F:91F8 - First room header pointer
 
 # Known room header pointers (area header tables in bank $8F)
 # These are pointers to the start of room data for each area
-AREA_ROOM_TABLE = {
-    0: snes_to_rom(0x8F, 0x91F8),   # Crateria
-    1: snes_to_rom(0x8F, 0x92B0),   # Brinstar
-    2: snes_to_rom(0x8F, 0x93B8),   # Norfair
-    3: snes_to_rom(0x8F, 0x948C),   # Wrecked Ship
-    4: snes_to_rom(0x8F, 0x9510),   # Maridia
-    5: snes_to_rom(0x8F, 0x95DC),   # Tourian
-    6: snes_to_rom(0x8F, 0x962A),   # Ceres
-}
+AREA_ROOM_TABLE = MappingProxyType({
+    0: 0x0791F8,   # $8F:91F8 Crateria
+    1: 0x0792B0,   # $8F:92B0 Brinstar
+    2: 0x0793B8,   # $8F:93B8 Norfair
+    3: 0x07948C,   # $8F:948C Wrecked Ship
+    4: 0x079510,   # $8F:9510 Maridia
+    5: 0x0795DC,   # $8F:95DC Tourian
+    6: 0x07962A,   # $8F:962A Ceres
+})
+
+# (output directory name, room table offset) per area, indexed by area ID.
+# A tuple so iteration order is explicit rather than dict insertion order.
+AREA_TABLE = (
+    ('crateria',     AREA_ROOM_TABLE[0]),
+    ('brinstar',     AREA_ROOM_TABLE[1]),
+    ('norfair',      AREA_ROOM_TABLE[2]),
+    ('wrecked_ship', AREA_ROOM_TABLE[3]),
+    ('maridia',      AREA_ROOM_TABLE[4]),
+    ('tourian',      AREA_ROOM_TABLE[5]),
+    ('ceres',        AREA_ROOM_TABLE[6]),
+)
 
 # Palette data (Bank $C2)
-PALETTE_DATA_START = snes_to_rom(0xC2, 0x8000)
+PALETTE_DATA_START = 0x210000  # $C2:8000
 
 # Tileset data banks
-TILESET_BANKS = {
+TILESET_BANKS = MappingProxyType({
     'cre':           (0xB9, 0x8000),  # Common Room Elements
     'crateria':      (0xBA, 0x8000),
     'brinstar':      (0xBB, 0x8000),
@@ -60,24 +79,49 @@ TILESET_BANKS = {
     'maridia':       (0xBE, 0x8000),
     'tourian':       (0xBF, 0x8000),
     'ceres':         (0xC0, 0x8000),
-}
+})
+
+# ROM offsets of the tileset banks above
+TILESET_OFFSETS = MappingProxyType({
+    'cre':           0x1C8000,  # $B9:8000
+    'crateria':      0x1D0000,  # $BA:8000
+    'brinstar':      0x1D8000,  # $BB:8000
+    'norfair':       0x1E0000,  # $BC:8000
+    'wrecked_ship':  0x1E8000,  # $BD:8000
+    'maridia':       0x1F0000,  # $BE:8000
+    'tourian':       0x1F8000,  # $BF:8000
+    'ceres':         0x200000,  # $C0:8000
+})
 
 # Level tilemap data (compressed, Banks $C3-$CE)
-LEVEL_DATA_START = snes_to_rom(0xC3, 0x8000)
-LEVEL_DATA_END   = snes_to_rom(0xCE, 0xFFFF)
+LEVEL_DATA_START = 0x218000  # $C3:8000
+LEVEL_DATA_END   = 0x277FFF  # $CE:FFFF
 
 # Samus sprite data
 SAMUS_SPRITES_START = 0x080000   # Banks $90-$9F
 SAMUS_SPRITES_DMA   = 0x0DEC00  # Documented main sprite start
 
 # Enemy graphics (Banks $AB-$B1, $B7)
-ENEMY_GFX_START = snes_to_rom(0xAB, 0x8000)
-ENEMY_GFX_END   = snes_to_rom(0xB1, 0xFFFF)
-ENEMY_GFX_EXTRA = snes_to_rom(0xB7, 0x8000)
+ENEMY_GFX_START = 0x158000  # $AB:8000
+ENEMY_GFX_END   = 0x18FFFF  # $B1:FFFF
+ENEMY_GFX_EXTRA = 0x1B8000  # $B7:8000
 
 # Music data (Banks $CF-$DE)
-MUSIC_DATA_START = snes_to_rom(0xCF, 0x8000)
-MUSIC_DATA_END   = snes_to_rom(0xDE, 0xFFFF)
+MUSIC_DATA_START = 0x278000  # $CF:8000
+MUSIC_DATA_END   = 0x2F7FFF  # $DE:FFFF
+
+# (bank, ROM offset of bank:$8000) for every raw bank dump. The ranges
+# are contiguous in ROM, so each offset is its range start plus the bank
+# index times ROM_BANK_SIZE.
+SAMUS_SPRITE_BANKS = tuple(
+    (bank, SAMUS_SPRITES_START + i * ROM_BANK_SIZE)
+    for i, bank in enumerate(range(0x90, 0xA0)))
+ENEMY_GFX_BANKS = tuple(
+    (bank, ENEMY_GFX_START + i * ROM_BANK_SIZE)
+    for i, bank in enumerate(range(0xAB, 0xB2))) + ((0xB7, ENEMY_GFX_EXTRA),)
+MUSIC_BANKS = tuple(
+    (bank, MUSIC_DATA_START + i * ROM_BANK_SIZE)
+    for i, bank in enumerate(range(0xCF, 0xDF)))
 
 # Door definitions (Bank $83)
 DOOR_DATA_BANK = 0x83
@@ -146,5 +190,39 @@ if __name__ == '__main__':
     print(f"Music data:         0x{MUSIC_DATA_START:06X} - 0x{MUSIC_DATA_END:06X}")
     print()
     for area_name, (bank, addr) in TILESET_BANKS.items():
-        offset = snes_to_rom(bank, addr)
+        offset = TILESET_OFFSETS[area_name]
         print(f"Tileset {area_name:15s}: Bank ${bank:02X} -> ROM 0x{offset:06X}")
+
+    # Check the precomputed offsets against the conversion formula
+    checks = [
+        ('ROOM_HEADERS_START', ROOM_HEADERS_START, snes_to_rom(0x8F, 0x91F8)),
+        ('PALETTE_DATA_START', PALETTE_DATA_START, snes_to_rom(0xC2, 0x8000)),
+        ('LEVEL_DATA_START',   LEVEL_DATA_START,   snes_to_rom(0xC3, 0x8000)),
+        ('LEVEL_DATA_END',     LEVEL_DATA_END,     snes_to_rom(0xCE, 0xFFFF)),
+        ('SAMUS_SPRITES_START', SAMUS_SPRITES_START, snes_to_rom(0x90, 0x8000)),
+        ('ENEMY_GFX_START',    ENEMY_GFX_START,    snes_to_rom(0xAB, 0x8000)),
+        ('ENEMY_GFX_END',      ENEMY_GFX_END,      snes_to_rom(0xB1, 0xFFFF)),
+        ('ENEMY_GFX_EXTRA',    ENEMY_GFX_EXTRA,    snes_to_rom(0xB7, 0x8000)),
+        ('MUSIC_DATA_START',   MUSIC_DATA_START,   snes_to_rom(0xCF, 0x8000)),
+        ('MUSIC_DATA_END',     MUSIC_DATA_END,     snes_to_rom(0xDE, 0xFFFF)),
+    ]
+    area_addrs = (0x91F8, 0x92B0, 0x93B8, 0x948C, 0x9510, 0x95DC, 0x962A)
+    for area_id, addr in enumerate(area_addrs):
+        checks.append((f'AREA_ROOM_TABLE[{area_id}]',
+                       AREA_ROOM_TABLE[area_id], snes_to_rom(0x8F, addr)))
+    for area_name, (bank, addr) in TILESET_BANKS.items():
+        checks.append((f'TILESET_OFFSETS[{area_name!r}]',
+                       TILESET_OFFSETS[area_name], snes_to_rom(bank, addr)))
+
+    for table_name, table in (('SAMUS_SPRITE_BANKS', SAMUS_SPRITE_BANKS),
+                              ('ENEMY_GFX_BANKS', ENEMY_GFX_BANKS),
+                              ('MUSIC_BANKS', MUSIC_BANKS)):
+        for bank, offset in table:
+            checks.append((f'{table_name}[${bank:02X}]', offset, snes_to_rom(bank, 0x8000)))
+
+    mismatches = [name for name, value, expected in checks if value != expected]
+    print()
+    if mismatches:
+        print(f"MISMATCH in precomputed offsets: {', '.join(mismatches)}")
+    else:
+        print("Precomputed offsets match snes_to_rom()")
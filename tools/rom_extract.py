@@ -5,21 +5,69 @@ Extracts tilesets, tilemaps, palettes, sprites, rooms, and audio data
 from a Super Metroid SNES ROM into individual files.
 
 Usage:
-    python tools/rom_extract.py [path_to_rom]
+    python tools/rom_extract.py [path_to_rom] [--merge-banks]
     Default ROM path: roms/
+    --merge-banks writes sprites/samus_sprites.bin, sprites/enemies/enemies.bin
+    and audio/music.bin instead of one file per bank.
 
 Output: assets_raw/ (gitignored)
+Decompressed LC_LZ2 blocks are cached in assets_raw/.lzcache/ so re-runs
+against the same ROM skip decompression. assets_raw/.cache/manifest.json
+records the outputs of the last full run; re-running against the same ROM
+(and extraction code) with every output still present does nothing unless
+--force is given, which also decompresses again instead of using the cache.
 """
 
+import argparse
+import hashlib
+import mmap
 import os
+import re
 import sys
 import struct
 import glob as glob_mod
+from concurrent.futures import ThreadPoolExecutor
 
 # Import sibling modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import lz_decompress
+import rom_addresses
 from rom_addresses import *
 from lz_decompress import decompress
+from asset_cache import atomic_write, code_version, load_manifest, save_manifest
+
+
+# Worker threads used to overlap batches of small file writes
+WRITE_WORKERS = 8
+
+# Cache of decompressed LC_LZ2 blocks, under the output directory
+LZ_CACHE_DIR = '.lzcache'
+
+# Manifest of the outputs of the last full extraction, under the output
+# directory
+MANIFEST_PATH = os.path.join('.cache', 'manifest.json')
+
+# Versions of the code behind cached LC_LZ2 blocks and a full extraction.
+# Part of the LZ cache and manifest keys, so editing any of these modules
+# stops older entries from being used.
+LZ_VERSION = code_version(lz_decompress.__file__)
+EXTRACT_VERSION = code_version(__file__, rom_addresses.__file__, lz_decompress.__file__)
+
+# Start of a plausible room header: area <= 7 at ROOM_HDR_AREA, width and
+# height 1-15 at ROOM_HDR_WIDTH/ROOM_HDR_HEIGHT. Searching with this runs
+# the per-byte scan in the regex engine instead of a Python loop.
+ROOM_HDR_PATTERN = re.compile(rb'.[\x00-\x07]..[\x01-\x0f][\x01-\x0f]', re.DOTALL)
+
+# Room header fields ROOM_HDR_INDEX..ROOM_HDR_DOORLIST, decoded in one call
+ROOM_HDR_STRUCT = struct.Struct('<9BH')
+
+# Little-endian field readers for read_u16/read_u24
+U16_STRUCT = struct.Struct('<H')
+U24_STRUCT = struct.Struct('<HB')
+
+# Blank palette blocks (all zeros / erased all-FF), compared against per block
+EMPTY_PALETTE = bytes(512)
+ERASED_PALETTE = b'\xFF' * 512
 
 
 def find_rom(rom_arg=None):
@@ -38,20 +86,31 @@ def find_rom(rom_arg=None):
     return None
 
 
-def load_rom(path):
-    """Load ROM, stripping optional copier header."""
+def load_rom(path, verbose=True):
+    """
+    Map ROM read-only, stripping optional copier header.
+
+    Returns a memoryview over an mmap of the file: reads are demand-paged
+    from the page cache and slices are views, so nothing is copied up front.
+    With verbose=False the size report and warnings are not printed.
+    """
     with open(path, 'rb') as f:
-        data = bytearray(f.read())
+        try:
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except ValueError:  # Empty files cannot be mapped
+            data = memoryview(b'')
 
     # Strip 512-byte copier header if present
     if len(data) % 0x8000 == 512:
-        print(f"  Stripping 512-byte copier header")
+        if verbose:
+            print(f"  Stripping 512-byte copier header")
         data = data[512:]
 
-    print(f"  ROM size: {len(data)} bytes (0x{len(data):06X})")
+    if verbose:
+        print(f"  ROM size: {len(data)} bytes (0x{len(data):06X})")
 
-    if len(data) != SM_ROM_SIZE:
-        print(f"  WARNING: Expected {SM_ROM_SIZE} bytes, got {len(data)}")
+        if len(data) != SM_ROM_SIZE:
+            print(f"  WARNING: Expected {SM_ROM_SIZE} bytes, got {len(data)}")
 
     return data
 
@@ -61,22 +120,137 @@ def ensure_dir(path):
     os.makedirs(path, exist_ok=True)
 
 
+def remove_file(path):
+    """Remove path if it exists."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def create_file(path, flags=0):
+    """
+    Open a fresh file at path for writing and return its descriptor.
+
+    Any existing file is unlinked first rather than truncated: converted
+    outputs in data/ may be hardlinks to files here (palette_converter
+    links through unchanged palettes), and truncating would rewrite them
+    with raw ROM bytes.
+    """
+    remove_file(path)
+    return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | flags, 0o644)
+
+
+def write_file(path, data):
+    """Write data to path with raw os.write() calls (no buffered layer)."""
+    fd = create_file(path, getattr(os, 'O_BINARY', 0))
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def write_rom_ranges(path, rom, ranges, rom_fd=None, header_size=0):
+    """
+    Write the (offset, length) ranges of rom back to back to path.
+
+    With a raw ROM file descriptor (rom_fd, plus the size of any stripped
+    copier header) and os.sendfile available, the kernel copies each range
+    page to page without it passing through Python. Otherwise -- Windows,
+    or platforms whose sendfile only accepts sockets -- the mmap-backed
+    view slices are written directly.
+    """
+    if rom_fd is not None and hasattr(os, 'sendfile'):
+        fd = create_file(path)
+        try:
+            for offset, length in ranges:
+                pos = header_size + offset
+                end = pos + length
+                while pos < end:
+                    sent = os.sendfile(fd, rom_fd, pos, end - pos)
+                    if sent == 0:
+                        break
+                    pos += sent
+            return
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    rom_mv = memoryview(rom)
+    views = [rom_mv[offset:offset + length] for offset, length in ranges]
+    write_file(path, views[0] if len(views) == 1 else b''.join(views))
+
+
+def cached_decompress(rom, offset, max_output, cache_dir, rom_sha1, refresh=False):
+    """
+    Decompress LC_LZ2 data at offset, reusing a cached result if present.
+
+    Entries are keyed by ROM SHA-1, LZ_VERSION, offset and max_output, so
+    a different ROM, size limit or decompressor never reads a stale entry.
+    With refresh, the cache is not read and the entry is rewritten.
+    """
+    key = f"{rom_sha1[:16]}_{LZ_VERSION}_{offset:06X}_{max_output:X}.bin"
+    cache_path = os.path.join(cache_dir, key)
+    if not refresh and os.path.isfile(cache_path):
+        with open(cache_path, 'rb') as f:
+            return f.read()
+
+    data = decompress(rom, offset, max_output=max_output)
+    atomic_write(cache_path, data)
+    return data
+
+
+def write_files(files):
+    """
+    Write a batch of (path, data) pairs concurrently.
+
+    Small-file writes are dominated by open/close and filesystem metadata
+    latency rather than data size. The GIL is released around those
+    syscalls, so a thread pool overlaps them instead of paying for each
+    file in turn.
+    """
+    with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as pool:
+        for _ in pool.map(lambda item: write_file(*item), files):
+            pass
+
+
+def write_rom_files(files, rom, rom_fd=None, header_size=0):
+    """
+    Write a batch of (path, ranges) pairs concurrently via write_rom_ranges.
+
+    sendfile takes an explicit ROM offset and never moves the shared
+    descriptor's file position, so workers can share rom_fd.
+    """
+    with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as pool:
+        for _ in pool.map(lambda item: write_rom_ranges(item[0], rom, item[1], rom_fd, header_size),
+                          files):
+            pass
+
+
 def read_u8(data, offset):
     return data[offset]
 
 def read_u16(data, offset):
-    return data[offset] | (data[offset + 1] << 8)
+    return U16_STRUCT.unpack_from(data, offset)[0]
 
 def read_u24(data, offset):
-    return data[offset] | (data[offset + 1] << 8) | (data[offset + 2] << 16)
+    low, bank = U24_STRUCT.unpack_from(data, offset)
+    return low | (bank << 16)
 
 
 # ============================================================
 # Palette extraction
 # ============================================================
 
-def extract_palettes(rom, output_dir):
-    """Extract palette data from bank $C2."""
+def extract_palettes(rom, output_dir, outputs=None):
+    """
+    Extract palette data from bank $C2.
+
+    Paths written are appended to outputs, if given.
+    """
     print("\n--- Extracting Palettes ---")
     pal_dir = os.path.join(output_dir, 'palettes')
     ensure_dir(pal_dir)
@@ -86,22 +260,24 @@ def extract_palettes(rom, output_dir):
 
     # Extract blocks of 512 bytes (256 colors * 2 bytes each)
     # We'll extract a generous range and let the converter sort out specifics
-    count = 0
-    offset = pal_start
-
     # Extract palette sets -- each area typically has multiple 32-byte (16-color) palettes
     # A full palette set is 256 colors = 512 bytes
-    while offset < pal_start + 0x4000 and offset + 512 <= len(rom):
-        pal_data = rom[offset:offset + 512]
-
-        # Basic validity check: not all zeros, not all FF
-        if pal_data != bytes(512) and pal_data != bytes([0xFF] * 512):
-            out_path = os.path.join(pal_dir, f'palette_{count:03d}.bin')
-            with open(out_path, 'wb') as f:
-                f.write(pal_data)
-            count += 1
-
-        offset += 512
+    #
+    # The region is copied out once (as bytes, so the blank checks are a
+    # plain memcmp) and split into whole blocks
+    pal_region = bytes(rom[pal_start:min(pal_start + 0x4000, len(rom))])
+    blocks = [pal_region[i:i + 512] for i in range(0, len(pal_region) - 511, 512)]
+
+    # Basic validity check: not all zeros, not all FF
+    palettes = [block for block in blocks
+                if block != EMPTY_PALETTE and block != ERASED_PALETTE]
+
+    files = [(os.path.join(pal_dir, f'palette_{count:03d}.bin'), pal_data)
+             for count, pal_data in enumerate(palettes)]
+    write_files(files)
+    if outputs is not None:
+        outputs.extend(path for path, _ in files)
+    count = len(palettes)
 
     print(f"  Extracted {count} palette sets to {pal_dir}")
     return count
@@ -111,23 +287,35 @@ def extract_palettes(rom, output_dir):
 # Tileset extraction
 # ============================================================
 
-def extract_tilesets(rom, output_dir):
-    """Extract and decompress tilesets from Banks $B9-$C1."""
+def extract_tilesets(rom, output_dir, refresh_cache=False, outputs=None):
+    """
+    Extract and decompress tilesets from Banks $B9-$C1.
+
+    With refresh_cache, every tileset is decompressed again instead of
+    being read from the LZ cache. Paths written are appended to outputs,
+    if given.
+    """
     print("\n--- Extracting Tilesets ---")
     ts_dir = os.path.join(output_dir, 'tilesets')
     ensure_dir(ts_dir)
 
+    cache_dir = os.path.join(output_dir, LZ_CACHE_DIR)
+    ensure_dir(cache_dir)
+    rom_sha1 = hashlib.sha1(rom).hexdigest()
+
     count = 0
     for name, (bank, addr) in TILESET_BANKS.items():
-        offset = snes_to_rom(bank, addr)
+        offset = TILESET_OFFSETS[name]
         print(f"  {name}: Bank ${bank:02X} -> ROM offset 0x{offset:06X}")
 
         try:
-            decompressed = decompress(rom, offset, max_output=0x20000)
+            decompressed = cached_decompress(rom, offset, 0x20000, cache_dir, rom_sha1,
+                                             refresh_cache)
             if len(decompressed) > 0:
                 out_path = os.path.join(ts_dir, f'{name}.bin')
-                with open(out_path, 'wb') as f:
-                    f.write(decompressed)
+                write_file(out_path, decompressed)
+                if outputs is not None:
+                    outputs.append(out_path)
                 print(f"    -> {len(decompressed)} bytes decompressed")
                 count += 1
             else:
@@ -143,8 +331,15 @@ def extract_tilesets(rom, output_dir):
 # Room header extraction
 # ============================================================
 
-def extract_rooms(rom, output_dir):
-    """Extract room headers and associated data pointers from bank $8F."""
+def extract_rooms(rom, output_dir, outputs=None):
+    """
+    Extract room headers and associated data pointers from bank $8F.
+
+    Each area's headers are packed back to back (ROOM_HDR_SIZE bytes each)
+    into rooms/<area>/rooms.bin; rooms/room_index.txt gives every room's
+    byte offset within its area's rooms.bin. Paths written are appended
+    to outputs, if given.
+    """
     print("\n--- Extracting Room Data ---")
     room_dir = os.path.join(output_dir, 'rooms')
     ensure_dir(room_dir)
@@ -154,24 +349,22 @@ def extract_rooms(rom, output_dir):
     # We'll scan the known area table offsets
 
     rooms = []
+    rooms_bins = []
     bank_8f_start = snes_to_rom(0x8F, 0x8000)
     bank_8f_end = snes_to_rom(0x8F, 0xFFFF)
 
     # Scan for room headers using area tables
-    area_names = ['crateria', 'brinstar', 'norfair', 'wrecked_ship',
-                  'maridia', 'tourian', 'ceres']
-
     # The room header list is a sequence of 2-byte pointers in bank $8F
     # Each pointer points to a room header within the same bank
     # We'll extract what we can find
 
-    for area_id, (area_name, table_offset) in enumerate(
-            zip(area_names, AREA_ROOM_TABLE.values())):
+    for area_id, (area_name, table_offset) in enumerate(AREA_TABLE):
 
         area_dir = os.path.join(room_dir, area_name)
         ensure_dir(area_dir)
 
         area_count = 0
+        area_headers = bytearray()
 
         # Scan forward from the area table offset for room-like data
         offset = table_offset
@@ -179,12 +372,9 @@ def extract_rooms(rom, output_dir):
 
         while offset < max_scan and offset + ROOM_HDR_SIZE <= len(rom):
             # Read room header
-            room_idx = read_u8(rom, offset + ROOM_HDR_INDEX)
-            area = read_u8(rom, offset + ROOM_HDR_AREA)
-            map_x = read_u8(rom, offset + ROOM_HDR_MAP_X)
-            map_y = read_u8(rom, offset + ROOM_HDR_MAP_Y)
-            width = read_u8(rom, offset + ROOM_HDR_WIDTH)
-            height = read_u8(rom, offset + ROOM_HDR_HEIGHT)
+            (room_idx, area, map_x, map_y, width, height,
+             up_scroll, down_scroll, gfx_flags,
+             door_ptr) = ROOM_HDR_STRUCT.unpack_from(rom, offset)
 
             # Validity check: reasonable dimensions
             if width == 0 or width > 15 or height == 0 or height > 15:
@@ -192,8 +382,6 @@ def extract_rooms(rom, output_dir):
             if area > 7:
                 break
 
-            door_ptr = read_u16(rom, offset + ROOM_HDR_DOORLIST)
-
             # Save room header
             room_data = {
                 'offset': offset,
@@ -204,15 +392,13 @@ def extract_rooms(rom, output_dir):
                 'width': width,
                 'height': height,
                 'door_ptr': door_ptr,
+                'area_name': area_name,
+                'bin_offset': len(area_headers),
             }
             rooms.append(room_data)
 
-            # Write room header binary
-            header_bytes = rom[offset:offset + ROOM_HDR_SIZE]
-            out_path = os.path.join(area_dir,
-                                     f'room_{area_count:03d}_0x{offset:06X}.bin')
-            with open(out_path, 'wb') as f:
-                f.write(header_bytes)
+            # Append room header binary to the area's packed rooms.bin
+            area_headers += rom[offset:offset + ROOM_HDR_SIZE]
 
             area_count += 1
 
@@ -224,20 +410,21 @@ def extract_rooms(rom, output_dir):
             # Skip state data entries until we hit the next room
             # (This is a simplification -- proper parsing requires following pointers)
             # For now, scan forward to find the next valid-looking header
-            scan = offset
-            while scan < max_scan - ROOM_HDR_SIZE:
-                next_width = read_u8(rom, scan + ROOM_HDR_WIDTH)
-                next_height = read_u8(rom, scan + ROOM_HDR_HEIGHT)
-                next_area = read_u8(rom, scan + ROOM_HDR_AREA)
-                if (1 <= next_width <= 15 and 1 <= next_height <= 15
-                        and next_area <= 7):
-                    break
-                scan += 1
-            offset = scan
+            # (candidates must start before max_scan - ROOM_HDR_SIZE)
+            match = ROOM_HDR_PATTERN.search(
+                rom, offset, max_scan - ROOM_HDR_SIZE + ROOM_HDR_HEIGHT)
+            if match:
+                offset = match.start()
+            else:
+                offset = max(offset, max_scan - ROOM_HDR_SIZE)
+
+        rooms_bins.append((os.path.join(area_dir, 'rooms.bin'), area_headers))
 
         if area_count > 0:
             print(f"  {area_name}: {area_count} rooms")
 
+    write_files(rooms_bins)
+
     # Write room index as JSON-like text
     index_path = os.path.join(room_dir, 'room_index.txt')
     with open(index_path, 'w') as f:
@@ -247,7 +434,12 @@ def extract_rooms(rom, output_dir):
                     f"area={r['area']} idx={r['index']} "
                     f"size={r['width']}x{r['height']} "
                     f"map=({r['map_x']},{r['map_y']}) "
-                    f"doors=0x{r['door_ptr']:04X}\n")
+                    f"doors=0x{r['door_ptr']:04X} "
+                    f"bin={r['area_name']}/rooms.bin+0x{r['bin_offset']:04X}\n")
+
+    if outputs is not None:
+        outputs.extend(path for path, _ in rooms_bins)
+        outputs.append(index_path)
 
     print(f"  Total: {len(rooms)} rooms extracted")
     return len(rooms)
@@ -257,58 +449,107 @@ def extract_rooms(rom, output_dir):
 # Sprite data extraction
 # ============================================================
 
-def extract_sprites(rom, output_dir):
-    """Extract Samus sprite graphics from banks $90-$9F."""
+def extract_sprites(rom, output_dir, rom_fd=None, header_size=0, merge_banks=False,
+                    outputs=None):
+    """
+    Extract Samus sprite graphics from banks $90-$9F.
+
+    rom_fd/header_size are passed through to write_rom_ranges. With
+    merge_banks, each contiguous bank range is written as one file
+    (samus_sprites.bin, enemies.bin) instead of one file per bank. Paths
+    written are appended to outputs, if given.
+    """
     print("\n--- Extracting Sprite Data ---")
     spr_dir = os.path.join(output_dir, 'sprites')
     ensure_dir(spr_dir)
 
-    # Extract raw banks for Samus sprites ($90-$9F = ROM $080000-$0FFFFF)
-    for bank in range(0x90, 0xA0):
-        bank_offset = snes_to_rom(bank, 0x8000)
-        bank_data = rom[bank_offset:bank_offset + ROM_BANK_SIZE]
-
-        out_path = os.path.join(spr_dir, f'samus_bank_{bank:02X}.bin')
-        with open(out_path, 'wb') as f:
-            f.write(bank_data)
-
-    print(f"  Extracted 16 Samus sprite banks to {spr_dir}")
-
-    # Extract enemy graphics banks ($AB-$B1, $B7)
+    # Enemy graphics banks ($AB-$B1, $B7)
     enemy_dir = os.path.join(spr_dir, 'enemies')
     ensure_dir(enemy_dir)
 
-    enemy_banks = list(range(0xAB, 0xB2)) + [0xB7]
-    for bank in enemy_banks:
-        bank_offset = snes_to_rom(bank, 0x8000)
-        bank_data = rom[bank_offset:bank_offset + ROM_BANK_SIZE]
-
-        out_path = os.path.join(enemy_dir, f'enemy_bank_{bank:02X}.bin')
-        with open(out_path, 'wb') as f:
-            f.write(bank_data)
-
-    print(f"  Extracted {len(enemy_banks)} enemy graphics banks")
+    # Raw banks for Samus sprites ($90-$9F = ROM $080000-$0FFFFF)
+    if merge_banks:
+        files = [
+            (os.path.join(spr_dir, 'samus_sprites.bin'),
+             [(SAMUS_SPRITES_START, 16 * ROM_BANK_SIZE)]),
+            (os.path.join(enemy_dir, 'enemies.bin'),
+             [(ENEMY_GFX_START, ENEMY_GFX_END + 1 - ENEMY_GFX_START),
+              (ENEMY_GFX_EXTRA, ROM_BANK_SIZE)]),
+        ]
+    else:
+        files = [(os.path.join(spr_dir, f'samus_bank_{bank:02X}.bin'),
+                  [(bank_offset, ROM_BANK_SIZE)])
+                 for bank, bank_offset in SAMUS_SPRITE_BANKS]
+        files += [(os.path.join(enemy_dir, f'enemy_bank_{bank:02X}.bin'),
+                   [(bank_offset, ROM_BANK_SIZE)])
+                  for bank, bank_offset in ENEMY_GFX_BANKS]
+
+    write_rom_files(files, rom, rom_fd, header_size)
+    if outputs is not None:
+        outputs.extend(path for path, _ in files)
+
+    print(f"  Extracted {len(SAMUS_SPRITE_BANKS)} Samus sprite banks to {spr_dir}")
+    print(f"  Extracted {len(ENEMY_GFX_BANKS)} enemy graphics banks")
 
 
 # ============================================================
 # Audio data extraction
 # ============================================================
 
-def extract_audio(rom, output_dir):
-    """Extract music/audio data from banks $CF-$DE."""
+def extract_audio(rom, output_dir, rom_fd=None, header_size=0, merge_banks=False,
+                  outputs=None):
+    """
+    Extract music/audio data from banks $CF-$DE.
+
+    rom_fd/header_size are passed through to write_rom_ranges. With
+    merge_banks, all banks are written as one music.bin. Paths written
+    are appended to outputs, if given.
+    """
     print("\n--- Extracting Audio Data ---")
     audio_dir = os.path.join(output_dir, 'audio')
     ensure_dir(audio_dir)
 
-    for bank in range(0xCF, 0xDF):
-        bank_offset = snes_to_rom(bank, 0x8000)
-        bank_data = rom[bank_offset:bank_offset + ROM_BANK_SIZE]
+    if merge_banks:
+        files = [(os.path.join(audio_dir, 'music.bin'),
+                  [(MUSIC_DATA_START, MUSIC_DATA_END + 1 - MUSIC_DATA_START)])]
+    else:
+        files = [(os.path.join(audio_dir, f'music_bank_{bank:02X}.bin'),
+                  [(bank_offset, ROM_BANK_SIZE)])
+                 for bank, bank_offset in MUSIC_BANKS]
 
-        out_path = os.path.join(audio_dir, f'music_bank_{bank:02X}.bin')
-        with open(out_path, 'wb') as f:
-            f.write(bank_data)
+    write_rom_files(files, rom, rom_fd, header_size)
+    if outputs is not None:
+        outputs.extend(path for path, _ in files)
 
-    print(f"  Extracted {0xDF - 0xCF} music banks to {audio_dir}")
+    print(f"  Extracted {len(MUSIC_BANKS)} music banks to {audio_dir}")
+
+
+# ============================================================
+# Extraction manifest
+# ============================================================
+
+def manifest_key(rom, merge_banks=False):
+    """Key for a full extraction: ROM SHA-256, EXTRACT_VERSION and bank layout."""
+    key = f"{hashlib.sha256(rom).hexdigest()[:16]}-{EXTRACT_VERSION}"
+    return key + '-merged' if merge_banks else key
+
+
+def manifest_is_fresh(output_dir, key):
+    """True if the manifest was written for key and all its outputs still exist."""
+    outputs = load_manifest(os.path.join(output_dir, MANIFEST_PATH)).get(key)
+    if not outputs:
+        return False
+    return all(os.path.isfile(os.path.join(output_dir, path)) for path in outputs)
+
+
+def write_manifest(output_dir, key, outputs):
+    """
+    Record the paths a full extraction wrote under key, replacing any
+    previous manifest. Stored relative to output_dir, '/'-separated.
+    """
+    outputs = sorted(os.path.relpath(path, output_dir).replace(os.sep, '/')
+                     for path in outputs)
+    save_manifest(os.path.join(output_dir, MANIFEST_PATH), {key: outputs})
 
 
 # ============================================================
@@ -316,14 +557,25 @@ def extract_audio(rom, output_dir):
 # ============================================================
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Extract Super Metroid ROM data into assets_raw/"
+    )
+    parser.add_argument("rom", nargs="?", help="Path to ROM file (default: first ROM in roms/)")
+    parser.add_argument("--rom", dest="rom_option", metavar="ROM",
+                        help="Path to ROM file (same as the positional argument)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-extract even if the manifest says output is up to date")
+    parser.add_argument("--merge-banks", action="store_true",
+                        help="Write each contiguous sprite/audio bank range as one file")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("  Super Metroid ROM Extractor")
     print("  Extracts game data for DS port conversion")
     print("=" * 60)
 
     # Find ROM
-    rom_arg = sys.argv[1] if len(sys.argv) > 1 else None
-    rom_path = find_rom(rom_arg)
+    rom_path = find_rom(args.rom_option or args.rom)
 
     if not rom_path:
         print("\nERROR: No ROM file found!")
@@ -341,12 +593,30 @@ def main():
     ensure_dir(output_dir)
     print(f"Output: {output_dir}")
 
-    # Extract all data types
-    pal_count = extract_palettes(rom, output_dir)
-    ts_count = extract_tilesets(rom, output_dir)
-    room_count = extract_rooms(rom, output_dir)
-    extract_sprites(rom, output_dir)
-    extract_audio(rom, output_dir)
+    # Extraction is deterministic in the ROM bytes: skip it if the last
+    # run was for this ROM and tool version and left its outputs in place
+    key = manifest_key(rom, args.merge_banks)
+    if not args.force and manifest_is_fresh(output_dir, key):
+        print(f"\nOutput is up to date for this ROM ({key}), skipping extraction")
+        print("  Use --force to re-extract")
+        return
+
+    # Extract all data types, collecting every path written
+    outputs = []
+    pal_count = extract_palettes(rom, output_dir, outputs)
+    ts_count = extract_tilesets(rom, output_dir, args.force, outputs)
+    room_count = extract_rooms(rom, output_dir, outputs)
+
+    # Raw bank dumps are copied file to file from the ROM itself
+    header_size = os.path.getsize(rom_path) - len(rom)
+    rom_fd = os.open(rom_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        extract_sprites(rom, output_dir, rom_fd, header_size, args.merge_banks, outputs)
+        extract_audio(rom, output_dir, rom_fd, header_size, args.merge_banks, outputs)
+    finally:
+        os.close(rom_fd)
+
+    write_manifest(output_dir, key, outputs)
 
     # Summary
     print("\n" + "=" * 60)
@@ -15,16 +15,73 @@ SNES 4bpp planar format (32 bytes per 8x8 tile):
 DS 4bpp linear format (32 bytes per 8x8 tile):
   Each byte holds 2 pixels (low nibble = even pixel, high nibble = odd pixel)
   4 bytes per row, 32 bytes per tile
+
+Conversion kernels (stdlib only, no per-pixel Python work):
+  snes_4bpp_to_ds_4bpp_tiles - whole files; stride slices + translate tables
+                               + big-int OR
+  snes_4bpp_to_ds_4bpp_tile  - single tiles; one SWAR bit transpose over the
+                               tile as a 1024-bit int
 """
 
 import argparse
 import sys
 
 
+def _plane_table(plane, column):
+    """
+    Build a translation table mapping one bitplane byte of a row to its
+    bits in DS output byte `column` (0-3) of that row.
+
+    Output byte `column` holds pixels 2*column (low nibble) and
+    2*column+1 (high nibble), i.e. bits 7-2*column and 6-2*column of the
+    plane byte; they land on bit `plane` of each nibble.
+    """
+    bit = 7 - 2 * column
+    return bytes((((v >> bit) & 1) << plane) | (((v >> (bit - 1)) & 1) << (plane + 4))
+                 for v in range(256))
+
+
+# PLANE_TABLES[plane][column] -- see _plane_table
+PLANE_TABLES = [[_plane_table(plane, column) for column in range(4)] for plane in range(4)]
+
+# Byte offset of bitplanes 0-3 relative to a row's first byte
+PLANE_OFFSETS = (0, 1, 16, 17)
+
+# Bit-reversal of every byte value (pixel 0 is bit 7 of a plane byte)
+REVERSE_BITS_TABLE = bytes(int(f'{v:08b}'[::-1], 2) for v in range(256))
+
+
+def _repeat(pattern, width, count):
+    """Repeat a `width`-bit mask `count` times across one big integer."""
+    return sum(pattern << (width * i) for i in range(count))
+
+
+# SWAR masks for a tile held as 32 lanes of 32 bits, one plane byte per lane:
+# three shift/OR/mask steps move lane bit i to bit 4*i (pixel i's nibble)
+SPREAD_MASKS = (
+    (12, _repeat(0x000F000F, 32, 32)),
+    (6, _repeat(0x03030303, 32, 32)),
+    (3, _repeat(0x11111111, 32, 32)),
+)
+
+# Bit position of each bitplane's 8 row lanes (planes 0, 1, 2, 3) once
+# spread; shifting group p down to bit p puts it on bit p of every nibble
+PLANE_LANE_BITS = (0, 512, 256, 768)
+PLANE_FOLD_SHIFTS = tuple(lane_bit - plane for plane, lane_bit in enumerate(PLANE_LANE_BITS))
+
+# Finished tile: 8 rows x 32 bits
+TILE_MASK = (1 << 256) - 1
+
+
 def snes_4bpp_to_ds_4bpp_tile(snes_data):
     """
     Convert a single 8x8 SNES 4bpp planar tile to DS 4bpp linear format.
 
+    The tile is transposed as one 1024-bit integer (SWAR): bitplanes 0, 2,
+    1 and 3 fill lanes 0-7, 8-15, 16-23 and 24-31 (one row per lane), each
+    lane's bits are spread to nibble positions, and the four plane groups
+    are shifted onto bits 0-3 of each nibble and OR-ed together.
+
     Args:
         snes_data: 32-byte bytearray/bytes containing SNES tile data
 
@@ -34,37 +91,64 @@ def snes_4bpp_to_ds_4bpp_tile(snes_data):
     if len(snes_data) != 32:
         raise ValueError(f"SNES 4bpp tile must be 32 bytes, got {len(snes_data)}")
 
-    ds_data = bytearray(32)
+    # Bitplane pairs are interleaved (CORRECT format): even bytes are
+    # planes 0 then 2 for rows 0-7, odd bytes are planes 1 then 3
+    reversed_data = bytes(snes_data).translate(REVERSE_BITS_TABLE)
+    lanes = bytearray(128)
+    lanes[0:64:4] = reversed_data[0::2]
+    lanes[64:128:4] = reversed_data[1::2]
+
+    value = int.from_bytes(lanes, 'little')
+    for shift, mask in SPREAD_MASKS:
+        value = (value | (value << shift)) & mask
+
+    # Fold the plane groups onto bits 0-3 of each pixel nibble
+    _, shift1, shift2, shift3 = PLANE_FOLD_SHIFTS
+    value = (value | (value >> shift1) | (value >> shift2) | (value >> shift3)) & TILE_MASK
+
+    return bytearray(value.to_bytes(32, 'little'))
+
+
+def snes_4bpp_to_ds_4bpp_tiles(snes_data):
+    """
+    Convert a run of whole SNES 4bpp tiles to DS format in one batch.
+
+    Works on one output byte position at a time across every tile: a
+    stride-32 slice gathers a bitplane byte from all tiles, PLANE_TABLES
+    moves its bits into place, and the four planes are OR-ed together as
+    big integers. All per-pixel work runs in C, so the cost is a fixed
+    ~32 slices + 128 translates per call rather than 64 steps per tile.
+
+    Args:
+        snes_data: bytes-like SNES tile data, a multiple of 32 bytes
+
+    Returns:
+        bytearray containing DS tile data (same length as the input)
+    """
+    if len(snes_data) % 32 != 0:
+        raise ValueError(f"SNES 4bpp tile data must be a multiple of 32 bytes, got {len(snes_data)}")
+
+    snes_data = bytes(snes_data)
+    tile_count = len(snes_data) // 32
+    ds_data = bytearray(len(snes_data))
 
     for y in range(8):
-        # Read bitplane pairs for this row (CORRECT interleaved format)
-        b0 = snes_data[y * 2 + 0]   # Bitplane 0
-        b1 = snes_data[y * 2 + 1]   # Bitplane 1
-        b2 = snes_data[y * 2 + 16]  # Bitplane 2
-        b3 = snes_data[y * 2 + 17]  # Bitplane 3
-
-        # Extract pixels for this row (MSB to LSB = left to right)
-        for x in range(8):
-            bit_pos = 7 - x  # MSB first
-
-            # Combine bitplanes to form 4-bit pixel value
-            pixel = (((b3 >> bit_pos) & 1) << 3) | \
-                    (((b2 >> bit_pos) & 1) << 2) | \
-                    (((b1 >> bit_pos) & 1) << 1) | \
-                    (((b0 >> bit_pos) & 1) << 0)
-
-            # Write to DS linear format (2 pixels per byte)
-            ds_byte_idx = y * 4 + x // 2
-            if x % 2 == 0:
-                # Even pixel: low nibble
-                ds_data[ds_byte_idx] = pixel & 0x0F
-            else:
-                # Odd pixel: high nibble
-                ds_data[ds_byte_idx] |= (pixel & 0x0F) << 4
+        planes = [snes_data[y * 2 + offset::32] for offset in PLANE_OFFSETS]
+        for column in range(4):
+            value = 0
+            for plane_bytes, tables in zip(planes, PLANE_TABLES):
+                value |= int.from_bytes(plane_bytes.translate(tables[column]), 'little')
+            ds_data[y * 4 + column::32] = value.to_bytes(tile_count, 'little')
 
     return ds_data
 
 
+# Whole-file kernels by tile_size; convert_tiles rejects any other size
+_SPECIALIZED = {
+    32: snes_4bpp_to_ds_4bpp_tiles,  # 4bpp
+}
+
+
 def convert_tiles(input_path, output_path, tile_size=32):
     """
     Convert a file of SNES tiles to DS format.
@@ -72,8 +156,14 @@ def convert_tiles(input_path, output_path, tile_size=32):
     Args:
         input_path: Path to input file containing SNES tile data
         output_path: Path to output file for DS tile data
-        tile_size: Size of each tile in bytes (default 32 for 4bpp)
+        tile_size: Size of each tile in bytes (default 32 for 4bpp); must
+                   have a kernel in _SPECIALIZED
     """
+    kernel = _SPECIALIZED.get(tile_size)
+    if kernel is None:
+        supported = ', '.join(str(size) for size in sorted(_SPECIALIZED))
+        raise ValueError(f"Unsupported tile_size {tile_size} (supported: {supported})")
+
     with open(input_path, 'rb') as f:
         snes_data = f.read()
 
@@ -81,21 +171,17 @@ def convert_tiles(input_path, output_path, tile_size=32):
         print(f"Warning: Input file size ({len(snes_data)} bytes) is not a multiple of tile_size ({tile_size})",
               file=sys.stderr)
 
-    ds_data = bytearray()
-    tile_count = 0
+    tile_count = len(snes_data) // tile_size
+    whole_size = tile_count * tile_size
 
-    for offset in range(0, len(snes_data), tile_size):
-        snes_tile = snes_data[offset:offset + tile_size]
+    if whole_size < len(snes_data):
+        print(f"Warning: Partial tile at offset {whole_size} ({len(snes_data) - whole_size} bytes), skipping",
+              file=sys.stderr)
 
-        if len(snes_tile) == tile_size:
-            ds_tile = snes_4bpp_to_ds_4bpp_tile(snes_tile)
-            ds_data.extend(ds_tile)
-            tile_count += 1
-        else:
-            print(f"Warning: Partial tile at offset {offset} ({len(snes_tile)} bytes), skipping",
-                  file=sys.stderr)
+    ds_data = kernel(snes_data[:whole_size])
 
-    with open(output_path, 'wb') as f:
+    # Unbuffered: the finished buffer goes out in a single write
+    with open(output_path, 'wb', buffering=0) as f:
         f.write(ds_data)
 
     print(f"Converted {tile_count} tiles from '{input_path}' to '{output_path}'")
@@ -108,7 +194,7 @@ def main():
     parser.add_argument("input_file", help="Input file containing SNES tile data")
     parser.add_argument("output_file", help="Output file for DS tile data")
     parser.add_argument("--tile_size", type=int, default=32,
-                        help="Size of each tile in bytes (default: 32 for 4bpp)")
+                        help="Size of each tile in bytes (default: 32 for 4bpp, the only supported size)")
 
     args = parser.parse_args()
 
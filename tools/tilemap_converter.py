@@ -18,13 +18,33 @@ DS BG map entry (2 bytes, 16-bit little-endian):
 """
 
 import argparse
+import os
 import sys
 
 
+def _ds_high_byte(byte1):
+    """Map the high byte of a SNES tilemap entry to the high byte of the DS entry."""
+    tile_high = byte1 & 0x03        # Tile number bits 9-8
+    h_flip = (byte1 >> 6) & 1       # Bit 14
+    v_flip = (byte1 >> 7) & 1       # Bit 15
+    palette = (byte1 >> 2) & 0x07   # Bits 12-10 (3 bits)
+    # priority = (byte1 >> 5) & 1  # Bit 13 (unused by DS)
+    return (palette << 4) | (v_flip << 3) | (h_flip << 2) | tile_high
+
+
+# The low byte (tile number bits 7-0) is identical in both formats, so an
+# entry converts by translating just its high byte through this table
+DS_HIGH_BYTE_TABLE = bytes(_ds_high_byte(b) for b in range(256))
+
+
 def snes_tilemap_to_ds_bgmap(snes_data):
     """
     Convert SNES tilemap entries to DS BG map format.
 
+    Both formats carry a 10-bit tile index in bits 0-9, so every entry is
+    representable; the whole map converts with one translate of the odd
+    (high) bytes through DS_HIGH_BYTE_TABLE.
+
     Args:
         snes_data: Byte array containing SNES tilemap data (2 bytes per entry)
 
@@ -34,33 +54,8 @@ def snes_tilemap_to_ds_bgmap(snes_data):
     if len(snes_data) % 2 != 0:
         raise ValueError(f"Tilemap data size must be even, got {len(snes_data)} bytes")
 
-    entry_count = len(snes_data) // 2
-    ds_data = bytearray(len(snes_data))
-
-    for i in range(entry_count):
-        offset = i * 2
-
-        # Read SNES entry
-        byte0 = snes_data[offset]
-        byte1 = snes_data[offset + 1]
-
-        # Extract SNES fields
-        tile_index = ((byte1 & 0x03) << 8) | byte0  # 10-bit tile number
-        h_flip = (byte1 >> 6) & 1                    # Bit 14
-        v_flip = (byte1 >> 7) & 1                    # Bit 15
-        palette = (byte1 >> 2) & 0x07                # Bits 12-10 (3 bits)
-        # priority = (byte1 >> 5) & 1               # Bit 13 (unused by DS)
-        if tile_index > 1023:  # DS only supports 10-bit tile index
-            print(f"Warning: Tile index {tile_index} at entry {i} exceeds DS limit (1023), truncating",
-                  file=sys.stderr)
-            tile_index &= 0x3FF
-
-        # Build DS BG map entry
-        ds_entry = (palette << 12) | (v_flip << 11) | (h_flip << 10) | tile_index
-
-        # Write as little-endian 16-bit value
-        ds_data[offset] = ds_entry & 0xFF
-        ds_data[offset + 1] = (ds_entry >> 8) & 0xFF
+    ds_data = bytearray(snes_data)
+    ds_data[1::2] = ds_data[1::2].translate(DS_HIGH_BYTE_TABLE)
 
     return ds_data
 
@@ -85,17 +80,58 @@ def convert_tilemap(input_path, output_path):
     print(f"Converted {entry_count} tilemap entries from '{input_path}' to '{output_path}'")
 
 
+# Converted maps are named <input stem>.ds.map
+DS_MAP_SUFFIX = ".ds.map"
+
+
+def ds_map_name(input_path):
+    """File name of the DS BG map converted from input_path."""
+    return os.path.splitext(os.path.basename(input_path))[0] + DS_MAP_SUFFIX
+
+
+def convert_all(input_paths, output_dir):
+    """
+    Convert many SNES tilemap files in one process.
+
+    Each entry costs microseconds to convert, so a batch is dominated by
+    per-file open/read/write; running it in one process avoids paying
+    interpreter (or worker pool) startup per file.
+
+    Args:
+        input_paths: Iterable of paths to input tilemap files
+        output_dir: Directory for the BG map files, named by ds_map_name()
+
+    Returns:
+        Number of tilemaps converted
+    """
+    count = 0
+    for input_path in input_paths:
+        convert_tilemap(input_path, os.path.join(output_dir, ds_map_name(input_path)))
+        count += 1
+
+    return count
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Convert SNES 16x16 metatile tilemap to DS BG map format"
     )
-    parser.add_argument("input_file", help="Input tilemap file (SNES format)")
-    parser.add_argument("output_file", help="Output BG map file (DS format)")
+    parser.add_argument("files", nargs="+", metavar="file",
+                        help="Input and output file, or with --output-dir any number of input files")
+    parser.add_argument("--output-dir",
+                        help="Convert every input file into this directory as <name>.ds.map")
 
     args = parser.parse_args()
 
+    if args.output_dir is None and len(args.files) != 2:
+        parser.error("expected an input and an output file (or use --output-dir)")
+
     try:
-        convert_tilemap(args.input_file, args.output_file)
+        if args.output_dir is not None:
+            os.makedirs(args.output_dir, exist_ok=True)
+            convert_all(args.files, args.output_dir)
+        else:
+            convert_tilemap(*args.files)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)